@@ -1,8 +1,43 @@
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
 from flask_cors import CORS
+from app.db import get_db_pool
+from app.utils.supabase import get_supabase_client
+import importlib
+import orjson
+import os
+
+cache = Cache()
+
+# (module, blueprint attribute, url prefix)
+BLUEPRINTS = (
+    ("app.routes.auth_routes", "auth_bp", "/api/v1/auth"),
+    ("app.routes.job_routes", "job_bp", "/api/v1/jobs"),
+    ("app.routes.user_jobs_routes", "user_jobs_bp", "/api/v1/user-jobs"),
+)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, used by jsonify() and request.get_json().
+
+    Keys stay sorted and dates go through Flask's default() as before, so
+    response bodies (and their ETags) are unchanged apart from raw UTF-8.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     # CORS(app, resources={r"/api/v1/*": {"origins": [
     #     # Allow the exact origin where your frontend is running
     #     "http://localhost:8080",
@@ -10,13 +45,21 @@ def create_app():
     # ]}}, supports_credentials=True)
     CORS(app, resources={r"/api/v1/*": {"origins": "*"}}, supports_credentials=True)
 
-    from app.routes.auth_routes import auth_bp
-    from app.routes.job_routes import job_bp
-    from app.routes.user_jobs_routes import user_jobs_bp
+    # Shared Redis cache in production; falls back to a per-process cache locally
+    redis_url = os.environ.get("REDIS_URL")
+    cache.init_app(app, config={
+        "CACHE_TYPE": "RedisCache" if redis_url else "SimpleCache",
+        "CACHE_REDIS_URL": redis_url,
+        "CACHE_DEFAULT_TIMEOUT": 60,
+    })
 
+    app.extensions["supabase"] = get_supabase_client()
+    # Opened here so a missing SUPABASE_DB_URL fails at startup, and so
+    # concurrent first requests can't each build their own pool.
+    app.extensions["db"] = get_db_pool()
 
-    app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
-    app.register_blueprint(job_bp, url_prefix='/api/v1/jobs')
-    app.register_blueprint(user_jobs_bp, url_prefix="/api/v1/user-jobs")
+    for module_name, blueprint_name, url_prefix in BLUEPRINTS:
+        blueprint = getattr(importlib.import_module(module_name), blueprint_name)
+        app.register_blueprint(blueprint, url_prefix=url_prefix)
 
     return app
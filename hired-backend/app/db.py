@@ -0,0 +1,33 @@
+from functools import lru_cache
+from flask import current_app
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+import atexit
+import os
+
+
+@lru_cache(maxsize=1)
+def get_db_pool() -> ConnectionPool:
+    # Direct Postgres connection through Supabase's Supavisor pooler, e.g.
+    # postgresql://postgres.<ref>:<password>@<region>.pooler.supabase.com:6543/postgres?sslmode=require
+    dsn = os.environ.get('SUPABASE_DB_URL')
+    if not dsn:
+        raise ValueError("Supabase DB URL missing in .env")
+
+    pool = ConnectionPool(
+        dsn,
+        min_size=2,
+        max_size=10,
+        # prepare_threshold=None: Supavisor transaction mode can't keep
+        # server-side prepared statements between transactions.
+        kwargs={"prepare_threshold": None, "row_factory": dict_row},
+        open=True,
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+def fetchrow(query, params=()):
+    # Pool opened once by create_app(), never lazily from a request thread
+    with current_app.extensions["db"].connection() as conn:
+        return conn.execute(query, params).fetchone()
@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import request, jsonify
-from app.utils.supabase import supabase  # Assuming you already have a Supabase client setup
+from app.utils.supabase import supabase
+from app.utils.tokens import verify_token
 
 def token_required(f):
     @wraps(f)
@@ -14,19 +15,26 @@ def token_required(f):
             # Extract token: "Bearer <token>"
             token = auth_header.split(" ")[1]
 
-            # Validate token with Supabase Auth
-            auth_resp = supabase.auth.get_user(token)
+            # Validate token locally, falling back to Supabase Auth
+            claims = verify_token(token)
 
-            if not auth_resp or not auth_resp.user:
-                return jsonify({"error": "Invalid or expired token"}), 403
+            if claims:
+                auth_uid = claims["sub"]  # UID from Supabase Auth
+                email = claims.get("email")
+            else:
+                auth_resp = supabase.auth.get_user(token)
 
-            auth_uid = auth_resp.user.id  # UID from Supabase Auth
+                if not auth_resp or not auth_resp.user:
+                    return jsonify({"error": "Invalid or expired token"}), 403
+
+                auth_uid = auth_resp.user.id  # UID from Supabase Auth
+                email = auth_resp.user.email
 
             # Fetch user from custom users table by auth_uid
             user_resp = (
                 supabase
                 .table("users")
-                .select("*")
+                .select("first_name, last_name, role")
                 .eq("auth_uid", auth_uid)
                 .single()
                 .execute()
@@ -36,7 +44,7 @@ def token_required(f):
                 return jsonify({"error": "User not found in users table"}), 404
 
             user = user_resp.data
-            user["email"] = auth_resp.user.email
+            user["email"] = email
             user["auth_uid"] = auth_uid
 
         except Exception as e:
@@ -1,11 +1,43 @@
+import re
+from typing import Optional
+import msgspec
 from flask import Blueprint, request, jsonify
-from app.supabase_client import supabase
-from app.utils.supabase import get_supabase_client
+from app.utils.supabase import new_auth_client, supabase
+from app.utils.tokens import verify_token
+from app import cache
+from app.db import fetchrow
 
 
 auth_bp = Blueprint('auth', __name__)
 
-supabase = get_supabase_client()
+# Error-message classifiers for the signup/login exception handlers
+_EXISTS_RE = re.compile(r"user already exists|already registered", re.IGNORECASE)
+_CLIENT_LIB_RE = re.compile(r"has no attribute '(error|user)'")
+_LOGIN_BAD_CREDS_RE = re.compile(
+    r"invalid login credentials|invalid email or password|user not found|no user with that email",
+    re.IGNORECASE,
+)
+
+
+# Request bodies. Fields are optional here so missing/empty values still get
+# the handlers' own "required" messages; the structs only enforce JSON types.
+class SignupIn(msgspec.Struct):
+    email: Optional[str] = None
+    password: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: Optional[str] = None
+
+
+class LoginIn(msgspec.Struct):
+    email: Optional[str] = None
+    password: Optional[str] = None
+
+
+def _profile_cache_key():
+    # Keyed on auth_uid only, so query strings don't fragment the cache
+    return f"profile:{request.view_args['auth_uid']}"
+
 
 @auth_bp.route("/health", methods=["GET"])
 def auth_health():
@@ -60,65 +92,48 @@ def auth_health():
 # ------------------------------------------------------
 @auth_bp.route("/signup", methods=["POST"])
 def signup():
-    data = request.get_json()
+    try:
+        payload = msgspec.json.decode(request.get_data(), type=SignupIn)
+    except msgspec.DecodeError as e:
+        return jsonify({"error": str(e)}), 400
 
-    email = data.get("email")
-    password = data.get("password")
-    first_name = data.get("first_name")
-    last_name = data.get("last_name") or ""
-    role = data.get("role")
+    email = payload.email
+    password = payload.password
+    first_name = payload.first_name
+    last_name = payload.last_name or ""
+    role = payload.role
 
-    if not all([email, password, first_name, role]):
+    if not (email and password and first_name and role):
         return jsonify({"error": "All fields are required"}), 400
 
     try:
-        # --- PHASE 1: Create user in Supabase Auth ---
-        user_response = supabase.auth.sign_up({
+        # Create user in Supabase Auth. The public.users profile is created in
+        # the same transaction by the on_auth_user_created trigger (see
+        # supabase/migrations), which reads these fields from the user metadata.
+        user_response = new_auth_client().sign_up({
             "email": email,
-            "password": password
+            "password": password,
+            "options": {
+                "data": {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "role": role
+                }
+            }
         })
         
         # If sign_up didn't crash, but failed to return user data
         if not user_response.user:
-            # Note: This is now a true failure since we handle the existing user case below.
             return jsonify({"error": "Supabase signup failed to return user data."}), 400
 
+        # With email confirmation on, GoTrue doesn't raise for an existing email:
+        # it returns an obfuscated user with no identities and inserts no auth.users
+        # row (so the profile trigger never runs).
+        if not user_response.user.identities:
+            return jsonify({"error": "This email is already registered. Please sign in."}), 409
+
         uid = user_response.user.id  # Supabase UID
 
-        # --- PHASE 2: Create/Update custom data in public.users (Explicit Upsert) ---
-        
-        # 2a. Check if the profile already exists (using the new UID)
-        profile_data = supabase.table("users").select("auth_uid").eq("auth_uid", uid).execute()
-        
-        user_profile_exists = len(profile_data.data) > 0
-        
-        profile_payload = {
-            "first_name": first_name,
-            "last_name": last_name,
-            "role": role,
-            # Removed 'created_at': 'now()' to simplify payload, as DB should handle default.
-        }
-
-        if user_profile_exists:
-            # 2b. If the profile exists -> UPDATE
-            db_op = supabase.table("users").update(profile_payload).eq("auth_uid", uid)
-        else:
-            # 2c. If the profile does NOT exist (Correct for a new user) -> INSERT
-            profile_payload["auth_uid"] = uid # Add the foreign key for insertion
-            db_op = supabase.table("users").insert(profile_payload)
-            
-        # Execute the chosen database operation
-        response = db_op.execute()
-        
-        # If the API response object is missing the expected attribute, 
-        # but the DB operation succeeded (which we know it does for new users),
-        # we still treat it as a success and return 201.
-        # Check only for *explicit* error attributes if the operation should have returned data.
-        if hasattr(response, 'error') and response.error: 
-            print(f"Database operation failed after successful Auth: {response.error}")
-            return jsonify({"error": "Profile creation/update failed. Please contact support."}), 500
-
-        # Success case for both new users (INSERT) and weird existing users (UPDATE)
         return jsonify({
             "message": "User registered successfully",
             "auth_uid": uid
@@ -127,22 +142,16 @@ def signup():
     # 🔥 Simplified Exception Handling: Catch all runtime errors and classify them.
     except Exception as e:
         error_message = str(e)
-        error_message_lower = error_message.lower()
-
-        # 1. Existing User / Auth Error Check (The most common cause of signup failure)
-        # We target the most common strings, including the new '23503' that appeared for existing users.
-        if "user already exists" in error_message_lower or \
-           "already registered" in error_message_lower or \
-           "insert or update on table \"users\" violates foreign key constraint" in error_message_lower or \
-           "key (auth_uid) is not present" in error_message_lower:
+
+        # 1. Existing User / Auth Error Check (raised when email confirmation is off)
+        if _EXISTS_RE.search(error_message):
             
             # Return 409 Conflict for resource conflict (existing user)
             return jsonify({"error": "This email is already registered. Please sign in."}), 409
 
         # 2. Supabase Client Library Error Check (Crashes on success/failure due to missing attributes)
         # This catches the AttributeError/APIResponse errors when the sign_up call fails gracefully or succeeds awkwardly.
-        if "has no attribute 'error'" in error_message or \
-           "has no attribute 'user'" in error_message:
+        if _CLIENT_LIB_RE.search(error_message):
             
             # We assume this is a Supabase client library internal error and it should have been a success 
             # or a user-already-exists error. Given the complexity, returning a 409 is the safest fallback.
@@ -205,16 +214,20 @@ def signup():
 # ------------------------------------------------------
 @auth_bp.route("/login", methods=["POST"])
 def login():
-    data = request.get_json()
-    email = data.get("email")
-    password = data.get("password")
+    try:
+        payload = msgspec.json.decode(request.get_data(), type=LoginIn)
+    except msgspec.DecodeError as e:
+        return jsonify({"error": str(e)}), 400
+
+    email = payload.email
+    password = payload.password
 
-    if not email or not password:
+    if not (email and password):
         return jsonify({"error": "Email and password required"}), 400
 
     try:
         # 1. Login with Supabase Auth
-        user = supabase.auth.sign_in_with_password({
+        user = new_auth_client().sign_in_with_password({
             "email": email,
             "password": password
         })
@@ -233,13 +246,14 @@ def login():
         uid = user.user.id # This line will not be reached if an exception is thrown
         
         # 2. Get user role + info from public.users
-        user_data = supabase.table("users").select("*").eq("auth_uid", uid).execute()
+        profile = fetchrow(
+            "SELECT first_name, last_name, role FROM public.users WHERE auth_uid = %s",
+            (uid,),
+        )
 
-        if not user_data.data:
+        if not profile:
             return jsonify({"error": "User not found in public.users"}), 404
 
-        profile = user_data.data[0]
-
         return jsonify({
             "message": "Login successful",
             "access_token": user.session.access_token,
@@ -258,18 +272,13 @@ def login():
     # We will assume that failed authentication due to wrong password/email results in an exception
     # with a specific message that we can detect, or we catch the generic exception and return 401.
     except Exception as e:
-        error_message = str(e).lower()
-        
-        # Check for specific Supabase-related error messages typically returned for failed login
+        # Check for specific Supabase-related error messages typically returned for failed login,
+        # including user-not-found errors (sometimes a separate exception).
         # This is a safe way to handle unknown specific library exceptions
-        if "invalid login credentials" in error_message or "invalid email or password" in error_message:
+        if _LOGIN_BAD_CREDS_RE.search(str(e)):
             # Return 401 Unauthorized with a generic, secure message
             return jsonify({"error": "Invalid email or password"}), 401
         
-        # Catch errors related to user not found (sometimes this is a separate exception)
-        if "user not found" in error_message or "no user with that email" in error_message:
-            return jsonify({"error": "Invalid email or password"}), 401
-        
         # Log the unexpected server error for debugging
         print(f"Unexpected server error during login: {e}") 
         
@@ -291,7 +300,16 @@ def protected_test():
 
         token = auth_header.split(" ")[1]
 
-        # Verify token with Supabase
+        # Verify the JWT locally first; no round-trip to Supabase Auth
+        claims = verify_token(token)
+        if claims:
+            return jsonify({
+                "message": "Token is valid",
+                "user_id": claims["sub"],
+                "email": claims.get("email")
+            }), 200
+
+        # Fall back to Supabase if the token couldn't be verified locally
         user = supabase.auth.get_user(token)
 
         if not user:
@@ -318,12 +336,30 @@ def protected_test():
 #         return jsonify({"error": str(e)}), 500
 
 @auth_bp.route('/profile/<auth_uid>', methods=['GET'])
+@cache.cached(timeout=60, key_prefix=_profile_cache_key, response_filter=lambda rv: rv[1] == 200)
 def profile(auth_uid):
     try:
-        response = supabase.table('users').select('*').eq('auth_uid', auth_uid).single().execute()
-        if response.data is None:
+        # Full row, as the public profile response has always returned; to_jsonb
+        # keeps the same JSON shapes PostgREST produced (timestamps, uuids)
+        row = fetchrow(
+            "SELECT to_jsonb(u) AS profile FROM public.users u WHERE u.auth_uid = %s",
+            (auth_uid,),
+        )
+        if row is None:
             return jsonify({"error": "User not found"}), 404
-        return jsonify(response.data), 200
+
+        # The ETag is stored with the cached response, so it is only hashed on a miss
+        resp = jsonify(row["profile"])
+        resp.add_etag()
+        resp.headers["Cache-Control"] = "private, max-age=30"
+        return resp, 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    
\ No newline at end of file
+
+
+@auth_bp.after_request
+def _conditional_response(response):
+    # Answer If-None-Match with 304 for responses carrying an ETag (cache hits included)
+    if response.status_code == 200 and response.get_etag()[0]:
+        response.make_conditional(request)
+    return response
@@ -1,10 +0,0 @@
-from supabase import create_client
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_SERVICE_KEY")
-
-supabase = create_client(url, key)
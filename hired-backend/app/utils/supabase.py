@@ -1,14 +1,68 @@
 from supabase import create_client, Client
+from supabase.lib.client_options import SyncClientOptions
+from supabase_auth import SyncGoTrueClient
+from supabase_auth.constants import DEFAULT_HEADERS
+from dotenv import load_dotenv
+from flask import current_app
+from functools import lru_cache
+from werkzeug.local import LocalProxy
+import atexit
+import httpx
 import os
 
-supabase: Client = None
-
-def get_supabase_client():
-    global supabase
-    if supabase is None:
-        url = os.environ.get('SUPABASE_URL')
-        key = os.environ.get('SUPABASE_SERVICE_KEY')
-        if not url or not key:
-            raise ValueError("Supabase URL or Key missing in .env")
-        supabase = create_client(url, key)
-    return supabase
+load_dotenv()
+
+# One pooled HTTP client shared by PostgREST, Auth and Storage so keep-alive
+# connections are reused across requests instead of re-handshaking each time.
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+
+def _get_credentials():
+    url = os.environ.get('SUPABASE_URL')
+    key = os.environ.get('SUPABASE_SERVICE_KEY')
+    if not url or not key:
+        raise ValueError("Supabase URL or Key missing in .env")
+    return url, key
+
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    # HTTP/2 (h2 is pinned in requirements) multiplexes concurrent calls over
+    # one connection; HTTP/1.1 stays enabled as a fallback.
+    http_client = httpx.Client(
+        http2=True,
+        limits=HTTP_LIMITS,
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+    )
+    atexit.register(http_client.close)
+    return http_client
+
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> Client:
+    # Service-role client for table, storage and admin calls. Never sign users
+    # in on it (use new_auth_client()): SIGNED_IN swaps its Authorization
+    # header for the user's JWT.
+    url, key = _get_credentials()
+    return create_client(url, key, options=SyncClientOptions(httpx_client=_get_http_client()))
+
+
+def new_auth_client() -> SyncGoTrueClient:
+    # Fresh GoTrue client for each auth.sign_up / auth.sign_in_with_password.
+    # A long-lived client would keep the last user's session, and SIGNED_IN
+    # rewrites its Authorization header for every later call on any thread.
+    # Building one per call is cheap: it reuses the pooled httpx connections.
+    url, key = _get_credentials()
+    return SyncGoTrueClient(
+        url=f"{url}/auth/v1",
+        headers={**DEFAULT_HEADERS, "apiKey": key, "Authorization": f"Bearer {key}"},
+        http_client=_get_http_client(),
+        auto_refresh_token=False,
+        persist_session=False,
+    )
+
+
+# Request-time handle on the client that create_app() wires into app.extensions
+supabase: Client = LocalProxy(lambda: current_app.extensions["supabase"])
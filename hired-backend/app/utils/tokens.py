@@ -0,0 +1,32 @@
+from functools import lru_cache
+import os
+import time
+import jwt
+
+
+@lru_cache(maxsize=10_000)
+def _decode_token(token, secret):
+    return jwt.decode(token, secret, algorithms=["HS256"], audience="authenticated")
+
+
+def verify_token(token):
+    """Verify a Supabase access token locally with the project's JWT secret.
+
+    Returns the token claims, or None if it can't be verified here (no secret
+    configured, bad signature, expired); callers then fall back to
+    supabase.auth.get_user().
+    """
+    secret = os.environ.get("SUPABASE_JWT_SECRET")
+    if not secret:
+        return None
+
+    try:
+        claims = _decode_token(token, secret)
+    except jwt.InvalidTokenError:
+        return None
+
+    # Cached claims can outlive the token itself
+    if claims.get("exp", 0) <= time.time():
+        return None
+
+    return claims
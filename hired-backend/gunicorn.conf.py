@@ -0,0 +1,13 @@
+# Gunicorn picks this file up automatically when started from this directory,
+# e.g. `gunicorn run:app`. Bind address and worker count still come from the
+# usual PORT / WEB_CONCURRENCY environment variables.
+import os
+
+# Handlers spend most of their time blocked on Supabase HTTP calls, so threaded
+# workers let one process keep many requests in flight on the shared pool.
+# This relies on sign-in/sign-up going through a fresh GoTrue client per call
+# (new_auth_client() in app/utils/supabase.py). Any long-lived supabase-py
+# client that signs users in stores their session and rewrites its
+# Authorization header, which other threads would then send.
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
@@ -0,0 +1,15 @@
+-- Unique constraint on users.auth_uid so signup can upsert with
+-- ON CONFLICT (auth_uid) instead of a select + insert/update pair.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint
+        WHERE conrelid = 'public.users'::regclass
+          AND conname = 'users_auth_uid_key'
+    ) THEN
+        ALTER TABLE public.users
+            ADD CONSTRAINT users_auth_uid_key UNIQUE (auth_uid);
+    END IF;
+END
+$$;
@@ -0,0 +1,38 @@
+-- Create the public.users profile in the same transaction as the Auth user,
+-- from the metadata signup() passes to auth.sign_up(options.data).
+--
+-- The trigger fires for every auth.users insert, including dashboard invites,
+-- admin-created users and OAuth sign-ins. Those carry no first_name/role
+-- metadata, so they are skipped rather than inserting NULLs. An insert error
+-- here would make GoTrue reject the user ("Database error saving new user").
+CREATE OR REPLACE FUNCTION public.handle_new_user()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+BEGIN
+    IF NEW.raw_user_meta_data ->> 'first_name' IS NULL
+       OR NEW.raw_user_meta_data ->> 'role' IS NULL THEN
+        RETURN NEW;
+    END IF;
+
+    INSERT INTO public.users (auth_uid, first_name, last_name, role)
+    VALUES (
+        NEW.id,
+        NEW.raw_user_meta_data ->> 'first_name',
+        COALESCE(NEW.raw_user_meta_data ->> 'last_name', ''),
+        NEW.raw_user_meta_data ->> 'role'
+    )
+    ON CONFLICT (auth_uid) DO UPDATE
+    SET first_name = EXCLUDED.first_name,
+        last_name = EXCLUDED.last_name,
+        role = EXCLUDED.role;
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS on_auth_user_created ON auth.users;
+CREATE TRIGGER on_auth_user_created
+    AFTER INSERT ON auth.users
+    FOR EACH ROW EXECUTE FUNCTION public.handle_new_user();
@@ -0,0 +1,24 @@
+-- users.auth_uid is already backed by the users_auth_uid_key unique index.
+-- No route filters users by role, so no role index is added.
+
+-- Indexes for the filter + ORDER BY pairs used by the job and user-jobs routes.
+
+-- GET /jobs/ (newest first)
+CREATE INDEX IF NOT EXISTS jobs_created_at_idx
+    ON public.jobs (created_at DESC);
+
+-- GET /jobs/my-jobs, recruiter application lookups
+CREATE INDEX IF NOT EXISTS jobs_recruiter_id_created_at_idx
+    ON public.jobs (recruiter_id, created_at DESC);
+
+-- GET /user-jobs/applications, duplicate-application check
+CREATE INDEX IF NOT EXISTS applications_candidate_id_applied_at_idx
+    ON public.applications (candidate_id, applied_at DESC);
+
+-- GET /user-jobs/applications/recruiter (job_id IN (...))
+CREATE INDEX IF NOT EXISTS applications_job_id_applied_at_idx
+    ON public.applications (job_id, applied_at DESC);
+
+-- GET /user-jobs/saved-jobs, duplicate-save check
+CREATE INDEX IF NOT EXISTS saved_jobs_user_id_saved_at_idx
+    ON public.saved_jobs (user_id, saved_at DESC);